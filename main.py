@@ -1,19 +1,54 @@
 import hashlib
+import hmac
+import io
 import json
+import mmap
 import os
 import datetime
+import queue
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, font, filedialog, simpledialog
 from PIL import Image, ImageTk # Resim işleme için Pillow (zaten yüklü olabilir, yoksa pip install gerekebilir)
 import shutil
 import uuid 
+try:
+    import orjson # Optional: faster config encode/decode, falls back to json below
+except ImportError:
+    orjson = None
 from tkinter import messagebox, scrolledtext, font
 
 # --- Configuration & Theme ---
 CONFIG_FILE = "config.json"
-JOURNAL_FILE = "journal.txt"
+JOURNAL_FILE = "journal.txt" # Legacy single-file journal, migrated into ENTRIES_DIR
+ENTRIES_DIR = "journal_entries" # One YYYY-MM-DD.txt file per entry
 IMAGES_DIR = "journal_images" 
+THUMBS_DIR = os.path.join(IMAGES_DIR, "thumbs") # Resized copies: <name>_<source mtime_ns>_<width>.png
+IO_BUFFER_SIZE = 1 << 20 # 1 MB write buffer
+DEFAULT_IMG_WIDTH = 400 # Width used by add_image and for markers without "|width"
+SMALL_IMG_WIDTH = 200 # At or below this width images are scaled with BILINEAR
+IMG_CACHE_SIZE = 64 # Resized PhotoImages kept around for re-renders
+STATUS_FLASH_MS = 2500 # How long save/update/delete confirmations stay in the status bar
+SOURCE_CACHE_PIXELS = 25_000_000 # Decoded originals kept for re-scaling (~100 MB of RGBA at most)
+PREFETCH_IMAGES = 8 # Prefetch decodes (neighbouring entries' images) in flight, at most
+DECODE_POLL_MS = 30 # How often the UI collects images decoded by the worker threads
+DECODE_WORKERS = min(4, os.cpu_count() or 1) # PIL releases the GIL while decoding/resampling
+
+# Compiled once at import; matches a "--- YYYY-MM-DD ---" separator line.
+# Bytes pattern: the journal is scanned undecoded (straight from an mmap).
+# The header must end its line, so a note line like "--- 2024-01-01 --- ..."
+# typed by the user is not taken as a separator
+_SEP_RE = re.compile(rb"--- (\d{2,4}-\d{1,2}-\d{1,2}) ---[ \t]*(?=\r?\n|\Z)")
+_DATE_RE = re.compile(r"\d{2,4}-\d{1,2}-\d{1,2}")
+
+# Image markers: <<IMG:filename|width>>. The Tcl pattern finds them inside the
+# Text widget, _IMG_RE then pulls filename/width out of each hit
+_IMG_SEARCH_PATTERN = r"<<IMG:[^>]*>>"
+# Thumbnail file name after "<stem>_": "<source mtime_ns>_<width>.png"
+_THUMB_SUFFIX_RE = re.compile(r"(\d+)_(\d+)\.png")
+_IMG_RE = re.compile(r"<<IMG:([^|>]+)(?:\|(\d+))?[^>]*>>")
 
 class Theme:
     BG_COLOR = "#2C3E50"        # Dark Blue/Gray
@@ -29,50 +64,356 @@ class Theme:
     FONT_FAMILY = "Segoe UI"    # Modern Windows Font
     
 # --- Utils ---
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+SALT_SIZE = 16
+# scrypt cost; stored next to each hash so it can be raised later without
+# breaking existing configs
+SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1}
+
+def hash_password(password, salt, params=SCRYPT_PARAMS):
+    """Derives the stored password hash with scrypt (salt is raw bytes)."""
+    return hashlib.scrypt(password.encode(), salt=salt, dklen=32, **params).hex()
+
+def hash_answer(answer, salt):
+    """Salted SHA-256 for the security answer; it is checked rarely, so no KDF."""
+    return hashlib.sha256(salt + answer.encode()).hexdigest()
+
+def legacy_hash(text):
+    """Unsalted SHA-256 used by configs created before salts were stored."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def make_password_fields(password):
+    salt = os.urandom(SALT_SIZE)
+    return {"salt": salt.hex(), "kdf": dict(SCRYPT_PARAMS), "password_hash": hash_password(password, salt)}
+
+def password_needs_rehash(data):
+    """True for legacy unsalted hashes or hashes made with an older scrypt cost."""
+    return "salt" not in data or data.get("kdf", SCRYPT_PARAMS) != SCRYPT_PARAMS
+
+def normalize_answer(answer, data=None):
+    """Case-insensitive form of a security answer. Configs without "answer_norm" were saved with lower()."""
+    if data is not None and data.get("answer_norm") != "casefold":
+        return answer.lower().strip()
+    return answer.casefold().strip()
+
+def make_answer_fields(answer):
+    salt = os.urandom(SALT_SIZE)
+    return {"answer_salt": salt.hex(), "answer_norm": "casefold",
+            "security_answer_hash": hash_answer(normalize_answer(answer), salt)}
+
+def answer_needs_rehash(data):
+    """True for unsalted answer hashes or answers normalized the old way."""
+    return "answer_salt" not in data or data.get("answer_norm") != "casefold"
+
+def check_password(password, data):
+    if "salt" in data:
+        computed = hash_password(password, bytes.fromhex(data["salt"]), data.get("kdf", SCRYPT_PARAMS))
+    else:
+        computed = legacy_hash(password)
+    # Constant-time comparison, no early exit on the first differing char
+    return hmac.compare_digest(data["password_hash"].encode(), computed.encode())
+
+def check_security_answer(answer, data):
+    answer = normalize_answer(answer, data)
+    if "answer_salt" in data:
+        computed = hash_answer(answer, bytes.fromhex(data["answer_salt"]))
+    else:
+        computed = legacy_hash(answer)
+    return hmac.compare_digest(data.get("security_answer_hash", "").encode(), computed.encode())
+
+def atomic_write(path, chunks):
+    """Writes byte chunks to path via a temp file + os.replace, so a crash never leaves it half-written."""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+if orjson is not None:
+    json_loads = orjson.loads # Accepts bytes; errors subclass ValueError like json's
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+    def json_dumps(data):
+        return json.dumps(data).encode("utf-8")
+
+def write_config(data):
+    atomic_write(CONFIG_FILE, [json_dumps(data)])
+
+class SourceImageCache:
+    """Thread-safe LRU of decoded source images, bounded by total pixel count."""
+    def __init__(self, max_pixels):
+        self.max_pixels = max_pixels
+        self._items = {} # key -> (value, pixels), least recently used first
+        self._pixels = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None:
+                return None
+            self._items[key] = item
+            return item[0]
+
+    def put(self, key, value, pixels):
+        # Too big to ever fit: don't cache it, and don't evict everything else for it
+        if pixels > self.max_pixels:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._pixels -= old[1]
+            self._items[key] = (value, pixels)
+            self._pixels += pixels
+            while self._pixels > self.max_pixels:
+                oldest = next(iter(self._items))
+                self._pixels -= self._items.pop(oldest)[1]
+
+_source_images = SourceImageCache(SOURCE_CACHE_PIXELS)
+
+def thumbnail_path(img_path, mtime_ns, width):
+    stem = os.path.splitext(os.path.basename(img_path))[0]
+    return os.path.join(THUMBS_DIR, f"{stem}_{mtime_ns}_{width}.png")
+
+def load_scaled_image(img_path, mtime_ns, width):
+    """Returns img_path as a PIL image scaled to width. Thread-safe: no Tk calls."""
+    # A resized copy saved on disk by an earlier session. Keyed like _img_cache,
+    # so a replaced original (whatever its mtime) never matches an old copy
+    thumb_path = thumbnail_path(img_path, mtime_ns, width)
+    try:
+        with Image.open(thumb_path) as pil_img:
+            pil_img.load()
+            return pil_img
+    except (OSError, SyntaxError):
+        pass # Missing, unreadable or corrupt: rebuilt from the source and overwritten below
+
+    src = load_source_image(img_path, mtime_ns, width)
+    # Keep Aspect Ratio
+    w_percent = (width / float(src.size[0]))
+    h_size = max(1, int((float(src.size[1]) * float(w_percent))))
+    # Below SMALL_IMG_WIDTH LANCZOS looks no better than BILINEAR, only slower
+    resample = Image.Resampling.BILINEAR if width <= SMALL_IMG_WIDTH else Image.Resampling.LANCZOS
+    # reducing_gap: box-reduce by an integer factor first, keeping >= 2x the
+    # target for the final filter (helps non-JPEG sources draft() can't shrink)
+    pil_img = src.resize((width, h_size), resample, reducing_gap=2.0)
+    save_thumbnail(pil_img, img_path, mtime_ns, width)
+    return pil_img
+
+def load_source_image(img_path, mtime_ns, width):
+    """Decoded original, good enough to scale to width; reuses an earlier decode when it can."""
+    key = (img_path, mtime_ns)
+    cached = _source_images.get(key)
+    # A drafted (reduced) decode only serves widths up to half its size
+    if cached is not None and (not cached[1] or cached[0].width >= width * 2):
+        return cached[0]
+
+    # One read into memory; the decoder then works without further file I/O
+    with open(img_path, "rb") as f:
+        data = f.read()
+    with Image.open(io.BytesIO(data)) as src:
+        full_size = src.size
+        h_size = max(1, int(src.size[1] * width / src.size[0]))
+        # JPEG only: let libjpeg decode at 1/2..1/8 scale. Aim for twice the
+        # target so the LANCZOS pass still has detail to filter from
+        src.draft("RGB", (width * 2, h_size * 2))
+        src.load()
+    _source_images.put(key, (src, src.size != full_size), src.width * src.height)
+    return src
+
+def save_thumbnail(pil_img, img_path, mtime_ns, width):
+    """Best effort: a thumbnail that cannot be written is simply rebuilt next time."""
+    thumb_path = thumbnail_path(img_path, mtime_ns, width)
+    try:
+        buf = io.BytesIO()
+        pil_img.save(buf, format="PNG")
+        os.makedirs(THUMBS_DIR, exist_ok=True)
+        atomic_write(thumb_path, [buf.getvalue()])
+    except (OSError, ValueError) as e:
+        print(f"Küçük resim kaydedilemedi: {e}")
+        return
+    # Copies of an earlier version of the original can never match again
+    remove_thumbnails(img_path, width=width, keep=thumb_path)
+
+def remove_thumbnails(img_path, width=None, keep=None):
+    """Deletes the cached thumbnails of img_path (only those at width, if given), except keep."""
+    prefix = os.path.splitext(os.path.basename(img_path))[0] + "_"
+    try:
+        names = os.listdir(THUMBS_DIR)
+    except OSError:
+        return
+    for name in names:
+        match = name.startswith(prefix) and _THUMB_SUFFIX_RE.fullmatch(name, len(prefix))
+        if not match or (width is not None and int(match.group(2)) != width):
+            continue
+        path = os.path.join(THUMBS_DIR, name)
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class Entry:
+    """A single journal entry stored in its own file; content is read on first access."""
+    __slots__ = ("date", "_content")
+
+    def __init__(self, date, content=None):
+        self.date = date
+        self._content = content
+
+    @property
+    def path(self):
+        return os.path.join(ENTRIES_DIR, f"{self.date}.txt")
+
+    @property
+    def content(self):
+        if self._content is None:
+            with open(self.path, "rb") as f:
+                self._content = EntryParser.decode(f.read())
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
 
 class EntryParser:
     """Parses and handles journal file operations."""
-    SEPARATOR_PATTERN = r"--- (\d{2,4}-\d{1,2}-\d{1,2}) ---"
+    SEPARATOR_PREFIX = b"--- "
 
     @staticmethod
-    def get_entries():
+    def find_headers(buf):
+        """Yields (date, header_start, body_start) for every separator line in buf (bytes or mmap)."""
+        prefix = EntryParser.SEPARATOR_PREFIX
+        line_prefix = b"\n" + prefix
+        # Headers start a line; the very first one may sit at offset 0
+        pos = 0 if buf[:len(prefix)] == prefix else buf.find(line_prefix)
+        while pos != -1:
+            start = pos if buf[pos:pos + len(prefix)] == prefix else pos + 1
+            # Only the candidate header line is checked against the regex
+            match = _SEP_RE.match(buf, start)
+            if match:
+                yield match.group(1).decode("ascii"), start, match.end()
+                pos = buf.find(line_prefix, match.end())
+            else:
+                pos = buf.find(line_prefix, start + 1)
+
+    @staticmethod
+    def decode(raw):
+        """Decodes raw journal bytes, normalizing line endings like text mode would."""
+        return raw.decode("utf-8").replace("\r\n", "\n")
+
+    @staticmethod
+    def parse_entries(buf):
+        """Splits raw journal bytes into Entry objects, oldest first; decodes one body at a time."""
+        entries = []
+        prev = None
+        for date_str, header_start, body_start in EntryParser.find_headers(buf):
+            if prev:
+                entries.append(Entry(prev[0], EntryParser.decode(buf[prev[1]:header_start]).strip()))
+            prev = (date_str, body_start)
+        if prev:
+            entries.append(Entry(prev[0], EntryParser.decode(buf[prev[1]:]).strip()))
+        return entries
+
+    @staticmethod
+    def migrate_legacy_journal():
+        """Splits the old single-file journal into per-date files, then renames it to .bak.
+
+        Returns the dates whose existing file differed and had the old text appended to it.
+        """
         if not os.path.exists(JOURNAL_FILE):
             return []
-        
-        with open(JOURNAL_FILE, "r", encoding="utf-8") as f:
-            content = f.read()
 
-        parts = re.split(EntryParser.SEPARATOR_PATTERN, content)
         entries = []
-        start_idx = 1 if len(parts) > 1 and parts[0].strip() == "" else 1
-        
-        for i in range(start_idx, len(parts), 2):
-            if i + 1 < len(parts):
-                date_str = parts[i]
-                entry_content = parts[i+1].strip()
-                entries.append({"date": date_str, "content": entry_content})
-        
-        # Return newest first
-        return entries[::-1]
+        if os.path.getsize(JOURNAL_FILE): # mmap refuses empty files
+            with open(JOURNAL_FILE, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                entries = EntryParser.parse_entries(mm)
+
+        # The old format allowed repeated dates; merge them in file order
+        merged = {}
+        for entry in entries:
+            if entry.date in merged:
+                merged[entry.date].content += "\n\n" + entry.content
+            else:
+                merged[entry.date] = entry
+
+        os.makedirs(ENTRIES_DIR, exist_ok=True)
+        conflicts = []
+        for entry in merged.values():
+            try:
+                with open(entry.path, "rb") as f:
+                    existing = EntryParser.decode(f.read())
+            except FileNotFoundError:
+                EntryParser.write_entry(entry)
+                continue
+            # Already there: written by an interrupted earlier run, or merged before
+            if entry.content in existing:
+                continue
+            # A journal.txt that showed up again (old app copy, synced folder):
+            # keep both texts rather than dropping either
+            entry.content = existing + "\n\n" + entry.content
+            EntryParser.write_entry(entry)
+            conflicts.append(entry.date)
+
+        # Never overwrite the backup of an earlier migration
+        backup = JOURNAL_FILE + ".bak"
+        n = 1
+        while os.path.exists(backup):
+            backup = f"{JOURNAL_FILE}.bak{n}"
+            n += 1
+        os.replace(JOURNAL_FILE, backup)
+        return conflicts
 
     @staticmethod
-    def save_all_entries(entries):
-        """Rewrites the entire journal file with the provided entries."""
-        # Entries are newest first in memory, but we want to write oldest first 
-        # (or newest first, but consistent). Let's stick to appending style structure.
-        # Original file was likely appended: Entry 1, Entry 2...
-        # So we should write them in reverse order of our list (which is New->Old)
-        # to keep chronological order in file if desired, OR just write them as is.
-        # To match the parser logic (which expects separators), we just write them.
-        
+    def date_key(date_str):
+        return tuple(int(part) for part in date_str.split("-"))
+
+    @staticmethod
+    def get_entries():
+        """Lists entries newest first; only file names are read, contents load lazily."""
         try:
-            with open(JOURNAL_FILE, "w", encoding="utf-8") as f:
-                # Write in chronological order (Oldest -> Newest) so new appends make sense
-                for entry in reversed(entries):
-                    f.write(f"\n\n--- {entry['date']} ---\n")
-                    f.write(entry['content'])
+            names = os.listdir(ENTRIES_DIR)
+        except FileNotFoundError:
+            return []
+
+        dates = [name[:-4] for name in names
+                 if name.endswith(".txt") and _DATE_RE.fullmatch(name[:-4])]
+        dates.sort(key=EntryParser.date_key, reverse=True)
+        return [Entry(date_str) for date_str in dates]
+
+    @staticmethod
+    def write_entry(entry):
+        """Writes one entry's file; raises OSError on failure."""
+        atomic_write(entry.path, [entry.content.encode("utf-8")])
+
+    @staticmethod
+    def create_entry(date_str, content):
+        """Stores a new entry and returns it; raises OSError on failure."""
+        entry = Entry(date_str, content)
+        os.makedirs(ENTRIES_DIR, exist_ok=True)
+        EntryParser.write_entry(entry)
+        return entry
+
+    @staticmethod
+    def save_entry(entry):
+        """Rewrites only this entry's file."""
+        try:
+            EntryParser.write_entry(entry)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def remove_entry(entry):
+        try:
+            os.remove(entry.path)
             return True
         except OSError:
             return False
@@ -81,13 +422,42 @@ class JournalApp:
     def __init__(self, root):
         self.root = root
         self.current_entry_index = None # Track which entry is being edited
-        self.image_refs = [] # Keep references to images to prevent garbage collection
+        self.image_refs = {} # group_tag -> PhotoImage it shows; keeps displayed images from being garbage collected
+        self._img_counter = 0 # Source of unique img_processed_<n> tag names
+        self._img_cache = {} # (img_path, mtime_ns, width) -> PhotoImage, least recently used first
+        # Image decoding runs on a thread pool; only PhotoImage creation and
+        # widget updates happen on the Tk thread (see _poll_decoded)
+        self._decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS)
+        self._decoded_q = queue.Queue()
+        self._decode_waiting = {} # Cache key being decoded -> group tags waiting for it
+        # Prefetching gets its own single worker, so it never queues ahead of
+        # the images of the entry on screen
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_futures = {} # Cache key -> future of a prefetch nobody is waiting on yet
+        self._prefetch_generation = 0 # Bumped per selection; older scan results are dropped
+        self._prefetched_q = queue.Queue() # (generation, image keys) found in neighbouring entries
+        self._prefetch_scans = 0 # Neighbour scans submitted but not yet collected
+        self._polling = False # A _poll_decoded call is scheduled
+        self._config = None # Parsed config.json, kept in sync with every write
+        self._content_ready = False # Journal editor widgets built (see _build_content)
+        self._screens = {} # Screen name -> its frame, built on first visit and kept
+        self._current_screen = None
         
         # Resim klasörünü oluştur
-        if not os.path.exists(IMAGES_DIR):
-            os.makedirs(IMAGES_DIR)
+        os.makedirs(IMAGES_DIR, exist_ok=True)
 
         self.setup_window()
+
+        # Eski tek dosyalı günlüğü (journal.txt) tarih başına dosyalara taşı
+        try:
+            conflicts = EntryParser.migrate_legacy_journal()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Hata", f"Eski günlük dosyası taşınamadı: {e}", parent=self.root)
+        else:
+            if conflicts:
+                messagebox.showwarning("Uyarı", "Eski günlükteki şu tarihler mevcut kayıtlardan farklıydı ve "
+                                       f"sonlarına eklendi: {', '.join(sorted(conflicts))}", parent=self.root)
+
         self.check_status() 
 
     def setup_window(self):
@@ -105,24 +475,42 @@ class JournalApp:
         self.main_container = tk.Frame(self.root, bg=Theme.BG_COLOR)
         self.main_container.pack(expand=True, fill="both")
 
-    def clear_container(self):
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
+    def switch_screen(self, name, build):
+        """Shows the named screen, building it with build(frame) only on the first visit."""
+        frame = self._screens.get(name)
+        if frame is None:
+            frame = tk.Frame(self.main_container, bg=Theme.BG_COLOR)
+            build(frame)
+            self._screens[name] = frame
+        if self._current_screen is not frame:
+            if self._current_screen is not None:
+                self._current_screen.pack_forget()
+            frame.pack(expand=True, fill="both")
+            self._current_screen = frame
+
+    def discard_screen(self, name):
+        """Destroys a screen that will not be visited again (e.g. setup once it is done)."""
+        frame = self._screens.pop(name, None)
+        if frame is not None:
+            if self._current_screen is frame:
+                self._current_screen = None
+            frame.destroy()
 
     def check_status(self):
-        if not os.path.exists(CONFIG_FILE):
+        # Parsed once here and kept in self._config for login/recovery
+        try:
+            with open(CONFIG_FILE, "rb") as f:
+                self._config = json_loads(f.read())
+        except FileNotFoundError:
             self.show_setup_screen()
-        else:
+        except (ValueError, OSError):
+            messagebox.showerror("Kritik Hata", "Yapılandırma dosyası bozuk.")
             try:
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    json.load(f)
-                self.show_login_screen()
-            except (json.JSONDecodeError, OSError):
-                messagebox.showerror("Kritik Hata", "Yapılandırma dosyası bozuk.")
-                try:
-                    os.remove(CONFIG_FILE)
-                    self.show_setup_screen()
-                except: pass
+                os.remove(CONFIG_FILE)
+                self.show_setup_screen()
+            except: pass
+        else:
+            self.show_login_screen()
 
     # --- UI Helpers ---
     def create_button(self, parent, text, command, bg_color=Theme.ACCENT_COLOR):
@@ -139,8 +527,11 @@ class JournalApp:
 
     # --- Screens ---
     def show_setup_screen(self):
-        self.clear_container()
-        frame = tk.Frame(self.main_container, bg=Theme.BG_COLOR)
+        self.switch_screen("setup", self._build_setup)
+        self.pwd_entry.focus()
+
+    def _build_setup(self, screen):
+        frame = tk.Frame(screen, bg=Theme.BG_COLOR)
         frame.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(frame, text="Hoşgeldiniz", font=(Theme.FONT_FAMILY, 24, "bold"), bg=Theme.BG_COLOR, fg=Theme.FG_COLOR).pack(pady=10)
@@ -160,14 +551,17 @@ class JournalApp:
         tk.Label(frame, text="Cevabınız:", font=(Theme.FONT_FAMILY, 12), bg=Theme.BG_COLOR, fg=Theme.FG_COLOR).pack(pady=5)
         self.security_a_entry = self.create_entry_input(frame)
         self.security_a_entry.pack(pady=5, fill="x")
-
-        self.pwd_entry.focus()
         
         self.create_button(frame, "Kurulumu Tamamla", self.save_setup, Theme.SUCCESS_COLOR).pack(pady=20, fill="x")
 
     def show_login_screen(self):
-        self.clear_container()
-        frame = tk.Frame(self.main_container, bg=Theme.BG_COLOR)
+        self.switch_screen("login", self._build_login)
+        # The screen is reused, so never leave the last password typed in it
+        self.login_entry.delete(0, tk.END)
+        self.login_entry.focus()
+
+    def _build_login(self, screen):
+        frame = tk.Frame(screen, bg=Theme.BG_COLOR)
         frame.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(frame, text="Giriş Yap", font=(Theme.FONT_FAMILY, 24, "bold"), bg=Theme.BG_COLOR, fg=Theme.FG_COLOR).pack(pady=20)
@@ -175,7 +569,6 @@ class JournalApp:
         self.login_entry = self.create_entry_input(frame, show="*")
         self.login_entry.pack(pady=10, fill="x")
         self.login_entry.bind('<Return>', lambda event: self.verify_login())
-        self.login_entry.focus()
         
         self.create_button(frame, "Giriş", self.verify_login).pack(pady=10, fill="x")
 
@@ -185,10 +578,26 @@ class JournalApp:
                   font=(Theme.FONT_FAMILY, 10, "underline")).pack(pady=5)
 
     def show_journal_screen(self):
-        self.clear_container()
-        
-        # Sidebar
-        sidebar = tk.Frame(self.main_container, bg=Theme.SIDEBAR_BG, width=250)
+        if "journal" in self._screens:
+            # Coming back after a logout: self.entries is still current, just
+            # reset the editor (the date may have changed meanwhile)
+            self.prepare_new_entry()
+        self.switch_screen("journal", self._build_journal)
+
+    def _build_journal(self, screen):
+        self._content_ready = False
+
+        # Sidebar and history first so something is on screen right away
+        self._build_sidebar(screen)
+        self.refresh_history()
+
+        # Content Area (filled once Tk is idle)
+        content_area = tk.Frame(screen, bg=Theme.BG_COLOR)
+        content_area.pack(side="right", expand=True, fill="both", padx=20, pady=20)
+        self.root.after_idle(self._build_content, content_area)
+
+    def _build_sidebar(self, screen):
+        sidebar = tk.Frame(screen, bg=Theme.SIDEBAR_BG, width=250)
         sidebar.pack(side="left", fill="y")
         sidebar.pack_propagate(False)
 
@@ -203,9 +612,10 @@ class JournalApp:
 
         self.create_button(sidebar, "+ Yeni Not", self.prepare_new_entry, Theme.SUCCESS_COLOR).pack(fill="x", padx=10, pady=20)
 
-        # Content Area
-        content_area = tk.Frame(self.main_container, bg=Theme.BG_COLOR)
-        content_area.pack(side="right", expand=True, fill="both", padx=20, pady=20)
+    def _build_content(self, content_area):
+        # The user may have logged out before the idle callback ran
+        if not content_area.winfo_exists():
+            return
 
         # Footer Actions (Pack First to ensure visibility at bottom)
         self.action_frame = tk.Frame(content_area, bg=Theme.BG_COLOR)
@@ -241,6 +651,8 @@ class JournalApp:
                                                     bg=Theme.INPUT_BG, fg=Theme.INPUT_FG,
                                                     insertbackground="black", relief="flat", padx=15, pady=15)
         self.journal_text.pack(side="top", expand=True, fill="both")
+        self.journal_text.tag_config("hidden_code", elide=True) # Image markers are hidden behind their picture
+        self.journal_text.bind("<Button-3>", self.on_text_right_click) # One handler for every image
 
         self.status_label = tk.Label(self.action_frame, text="Hazır", bg=Theme.BG_COLOR, fg="#95a5a6", font=(Theme.FONT_FAMILY, 9))
         self.status_label.pack(side="left")
@@ -253,6 +665,15 @@ class JournalApp:
         self.delete_btn = self.create_button(self.btn_frame, "🗑️ Sil", self.delete_entry, Theme.ERROR_COLOR)
         self.save_btn = self.create_button(self.btn_frame, "💾 Kaydet", self.save_entry, Theme.ACCENT_COLOR)
         self.update_btn = self.create_button(self.btn_frame, "💾 Güncelle", self.update_entry, Theme.SUCCESS_COLOR)
+
+        # Grid once, then toggle with grid()/grid_remove(); Tk keeps the
+        # grid options so mode switches don't redo the layout setup
+        self.edit_btn.grid(row=0, column=0)
+        self.delete_btn.grid(row=0, column=1, padx=(0, 10))
+        self.update_btn.grid(row=0, column=2)
+        self.save_btn.grid(row=0, column=3)
+        for btn in (self.edit_btn, self.delete_btn, self.update_btn, self.save_btn):
+            btn.grid_remove()
         
         # Resim Ekle Butonu - Ayrı bir yerde dursun (örneğin başlıkta veya altta)
         self.add_img_btn = tk.Button(self.header_btn_frame, text="📷 Fotoğraf Ekle", command=self.add_image,
@@ -261,7 +682,7 @@ class JournalApp:
         self.add_img_btn.pack(side="left", padx=5) 
 
         # Initial Load
-        self.refresh_history()
+        self._content_ready = True
         self.prepare_new_entry()
 
     # --- Actions ---
@@ -275,42 +696,52 @@ class JournalApp:
             return
 
         try:
-            config_data = {
-                "password_hash": hash_password(pwd),
-                "security_question": sq,
-                "security_answer_hash": hash_password(sa.lower().strip()) # Cevapları küçük harf ve boşluksuz kaydedelim
-            }
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
+            config_data = make_password_fields(pwd)
+            config_data["security_question"] = sq
+            config_data.update(make_answer_fields(sa)) # Cevap büyük/küçük harf duyarsız ve boşluksuz saklanır
+            self.store_config(config_data)
+            self.discard_screen("setup")
             self.show_login_screen()
         except OSError as e:
             messagebox.showerror("Hata", f"Hata: {e}", parent=self.root)
 
+    def store_config(self, data):
+        """Write-through: self._config only changes once data is safely on disk."""
+        write_config(data)
+        self._config = data
+
     def verify_login(self):
         pwd = self.login_entry.get()
         if not pwd: return
+        data = self._config
         try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            stored_hash = data.get("password_hash")
-            
-            if stored_hash == hash_password(pwd):
-                self.show_journal_screen()
-            else:
-                messagebox.showerror("Hata", "Yanlış şifre!", parent=self.root)
-                self.login_entry.delete(0, tk.END)
-        except Exception:
-            pass
+            password_ok = check_password(pwd, data)
+        except (KeyError, ValueError, TypeError) as e:
+            # Missing/garbled hash, salt or scrypt parameters: report it instead of silently doing nothing
+            messagebox.showerror("Hata", f"Yapılandırma dosyası bozuk: {e}", parent=self.root)
+            return
+
+        if password_ok:
+            if password_needs_rehash(data):
+                # Eski (tuzsuz / düşük maliyetli) hash'i yeni formata yükselt
+                upgraded = dict(data)
+                upgraded.update(make_password_fields(pwd))
+                try:
+                    self.store_config(upgraded)
+                except OSError:
+                    pass
+            self.show_journal_screen()
+        else:
+            messagebox.showerror("Hata", "Yanlış şifre!", parent=self.root)
+            self.login_entry.delete(0, tk.END)
 
     def recover_password(self):
-        if not os.path.exists(CONFIG_FILE):
+        if self._config is None:
             messagebox.showerror("Hata", "Yapılandırma dosyası bulunamadı.", parent=self.root)
             return
 
         try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._config
             
             question = data.get("security_question")
             if not question:
@@ -338,10 +769,13 @@ class JournalApp:
             answer_entry.focus()
             
             def check_answer():
-                ans = answer_entry.get().lower().strip()
-                if hash_password(ans) == data.get("security_answer_hash"):
+                ans = answer_entry.get()
+                if check_security_answer(ans, data):
+                    current = dict(data)
+                    if answer_needs_rehash(current):
+                        current.update(make_answer_fields(ans)) # Şifre sıfırlanınca yeni formatta kaydedilir
                     dialog.destroy()
-                    self.show_reset_password_dialog(data) # Mevcut datayı geçirelim ki diğer veriler kaybolmasın (eğer varsa)
+                    self.show_reset_password_dialog(current) # Mevcut datayı geçirelim ki diğer veriler kaybolmasın (eğer varsa)
                 else:
                     messagebox.showerror("Hata", "Yanlış cevap!", parent=dialog)
 
@@ -386,10 +820,9 @@ class JournalApp:
                 
             try:
                 # Sadece şifreyi güncelle, soru ve cevabı koru
-                current_data["password_hash"] = hash_password(p1)
-                
-                with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                    json.dump(current_data, f)
+                new_data = dict(current_data)
+                new_data.update(make_password_fields(p1))
+                self.store_config(new_data)
                 
                 messagebox.showinfo("Başarılı", "Şifreniz sıfırlandı. Yeni şifrenizle giriş yapabilirsiniz.", parent=dialog)
                 dialog.destroy()
@@ -399,77 +832,112 @@ class JournalApp:
         tk.Button(dialog, text="Şifreyi Güncelle", command=save_new_reset, bg=Theme.SUCCESS_COLOR, fg="white").pack(pady=20)
 
     def refresh_history(self):
-        self.history_listbox.delete(0, tk.END)
         self.entries = EntryParser.get_entries()
-        for entry in self.entries:
-            self.history_listbox.insert(tk.END, f"📅 {entry['date']}")
+        self.index_entries()
+        self.populate_history()
+
+    def populate_history(self):
+        """Repaints the listbox from self.entries without touching the disk."""
+        self.history_listbox.delete(0, tk.END)
+        # Single insert call instead of one Tcl round-trip per row
+        labels = [f"📅 {entry.date}" for entry in self.entries]
+        if labels:
+            self.history_listbox.insert(tk.END, *labels)
+
+    def index_entries(self, start=0):
+        """Rebuilds the date -> position lookup for self.entries[start:]."""
+        if start == 0:
+            self._date_index = {}
+        # Walk backwards so the newest entry wins if a date is duplicated
+        for i in range(len(self.entries) - 1, start - 1, -1):
+            self._date_index[self.entries[i].date] = i
 
     def on_entry_select(self, event):
+        """Shows the selected entry in view mode; returns False if nothing was opened."""
+        if not self._content_ready: return False # Editor not built yet
         selection = self.history_listbox.curselection()
-        if not selection: return
+        if not selection: return False
         
+        entry = self.entries[selection[0]]
+        # Read the file before touching the editor, so a failure leaves it as it was
+        try:
+            content = entry.content
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Hata", f"Kayıt okunamadı: {e}", parent=self.root)
+            # Point the list back at the entry the editor still shows
+            self.history_listbox.selection_clear(0, tk.END)
+            if self.current_entry_index is not None:
+                self.history_listbox.selection_set(self.current_entry_index)
+            return False
         self.current_entry_index = selection[0]
-        entry = self.entries[self.current_entry_index]
         
         # View Mode State
-        self.title_label.config(text=f"Kayıt: {entry['date']}")
+        self.title_label.config(text=f"Kayıt: {entry.date}")
         self.journal_text.config(state="normal")
         self.journal_text.delete("1.0", tk.END)
-        self.journal_text.insert("1.0", entry['content'])
+        self.journal_text.insert("1.0", content)
         
         # Görselleri Yükle
         self.render_images(clear_refs=True)
+        self.root.after_idle(self.prefetch_neighbours, self.current_entry_index)
         
         self.journal_text.config(state="disabled", bg=Theme.INPUT_BG)
         
         # Button State: Show Edit/Delete, Hide Save/Update
-        self.save_btn.pack_forget()
-        self.update_btn.pack_forget()
+        self.save_btn.grid_remove()
+        self.update_btn.grid_remove()
         self.add_img_btn.pack_forget() # Resim ekleme butonu gizle (düzenleme modunda açacağız)
-        self.delete_btn.pack(side="right", padx=(0, 10))
-        self.edit_btn.pack(side="right")
+        self.delete_btn.grid()
+        self.edit_btn.grid()
         
         self.status_label.config(text="Geçmiş görüntüleniyor (Düzenlemek için butona basın)", fg="#F39C12") 
+        return True
+
+    def flash_status(self, text, color, ms=STATUS_FLASH_MS):
+        """Shows a short-lived confirmation in the status bar instead of a modal popup."""
+        previous = self.status_label.cget("text"), self.status_label.cget("fg")
+        self.status_label.config(text=text, fg=color)
+
+        def restore():
+            # Leave it alone if something else has written a status since
+            if self.status_label.winfo_exists() and self.status_label.cget("text") == text:
+                self.status_label.config(text=previous[0], fg=previous[1])
+        self.root.after(ms, restore)
 
     def enable_edit_mode(self):
         self.journal_text.config(state="normal", bg="#FFF8DC") # Slightly different color for edit
-        self.edit_btn.pack_forget()
-        self.delete_btn.pack_forget() # Hide delete while editing
-        self.update_btn.pack(side="right")
+        self.edit_btn.grid_remove()
+        self.delete_btn.grid_remove() # Hide delete while editing
+        self.update_btn.grid()
         self.add_img_btn.pack(side="left", padx=5) # Resim eklemeyi göster
         self.status_label.config(text="✏️ Düzenleme modu aktif", fg=Theme.WARNING_COLOR) 
 
     def prepare_new_entry(self):
-        # Refresh entries to ensure we have the latest data
-        self.entries = EntryParser.get_entries() # Ensure self.entries is up to date if not already
-        
-        today_storage = datetime.datetime.now().strftime("%Y-%m-%d")
+        # _build_content calls this itself once the editor exists
+        if not self._content_ready: return
+
+        today = datetime.date.today()
+        today_storage = today.isoformat()
         
         # Check if entry already exists for today
-        found_index = None
-        for i, entry in enumerate(self.entries):
-            if entry['date'] == today_storage:
-                found_index = i
-                break
+        found_index = self._date_index.get(today_storage)
         
         if found_index is not None:
             # Entry exists - Open it instead of new
-            self.current_entry_index = found_index
-            
             # Select in listbox
             self.history_listbox.selection_clear(0, tk.END)
             self.history_listbox.selection_set(found_index)
             self.history_listbox.see(found_index)
             
-            # Simulate selection event to trigger View Mode
-            self.on_entry_select(None)
-            
-            self.status_label.config(text="Bugünün kaydı mevcut. Düzenlemek için 'Düzenle'ye basın.", fg=Theme.WARNING_COLOR)
-            return
+            # Simulate selection event to trigger View Mode; it sets
+            # current_entry_index only once the file has been read
+            if self.on_entry_select(None):
+                self.status_label.config(text="Bugünün kaydı mevcut. Düzenlemek için 'Düzenle'ye basın.", fg=Theme.WARNING_COLOR)
+                return
 
-        # No entry exists, proceed with new
+        # No (readable) entry for today, proceed with new
         self.current_entry_index = None
-        today_display = datetime.datetime.now().strftime("%d-%m-%Y")
+        today_display = f"{today.day:02d}-{today.month:02d}-{today.year}"
         self.title_label.config(text=f"Yeni Giriş ({today_display})")
         
         self.journal_text.config(state="normal", bg=Theme.INPUT_BG)
@@ -478,59 +946,60 @@ class JournalApp:
         
         # Button State: Show Save, Hide Edit/Update/Delete
         # Button State: Show Save, Hide Edit/Update/Delete
-        self.edit_btn.pack_forget()
-        self.update_btn.pack_forget()
-        self.delete_btn.pack_forget()
+        self.edit_btn.grid_remove()
+        self.update_btn.grid_remove()
+        self.delete_btn.grid_remove()
         self.add_img_btn.pack(side="left", padx=5) # Yeni kayıtta göster
-        if not self.save_btn.winfo_ismapped():
-            self.save_btn.pack(side="right") 
+        self.save_btn.grid()
         
         self.status_label.config(text="Yazmaya başlayın...", fg="#95a5a6")
 
     def save_entry(self):
-        content = self.journal_text.get("1.0", tk.END).strip()
+        content = self.journal_text.get("1.0", "end-1c").strip()
         if not content:
             self.status_label.config(text="⚠️ Boş içerik kaydedilmedi", fg=Theme.ERROR_COLOR)
             return
 
-        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        current_date = datetime.date.today().isoformat()
         
         # Double check duplication guard
-        for entry in self.entries:
-            if entry['date'] == current_date:
-                messagebox.showwarning("Uyarı", "Bugün için zaten bir kayıt var. Lütfen listeden seçip düzenleyin.")
-                self.prepare_new_entry() # Redirect to existing
-                return
+        if current_date in self._date_index:
+            messagebox.showwarning("Uyarı", "Bugün için zaten bir kayıt var. Lütfen listeden seçip düzenleyin.")
+            self.prepare_new_entry() # Redirect to existing
+            return
 
         try:
-            with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
-                f.write(f"\n\n--- {current_date} ---\n")
-                f.write(content)
+            new_entry = EntryParser.create_entry(current_date, content)
             
-            messagebox.showinfo("Başarılı", "Not kaydedildi.", parent=self.root)
-            self.refresh_history()
+            # Newest entry goes first; no need to re-list the directory
+            self.entries.insert(0, new_entry)
+            for date in self._date_index:
+                self._date_index[date] += 1
+            self._date_index[current_date] = 0
+            
+            self.populate_history()
             self.prepare_new_entry()
+            self.flash_status("✅ Not kaydedildi", Theme.SUCCESS_COLOR)
         except OSError as e:
             messagebox.showerror("Hata", f"Yazma hatası: {e}")
 
     def update_entry(self):
         if self.current_entry_index is None: return
         
-        content = self.journal_text.get("1.0", tk.END).strip()
+        content = self.journal_text.get("1.0", "end-1c").strip()
         if not content:
             messagebox.showwarning("Uyarı", "İçerik boş olamaz.")
             return
 
         # Update data in memory
-        self.entries[self.current_entry_index]['content'] = content
+        entry = self.entries[self.current_entry_index]
+        entry.content = content
         
-        # Rewrite file
-        if EntryParser.save_all_entries(self.entries):
-            messagebox.showinfo("Başarılı", "Not güncellendi.", parent=self.root)
-            self.refresh_history()
+        # Rewrite only this entry's file
+        if EntryParser.save_entry(entry):
             # Reselect the updated entry to stay in view mode or reset
             self.prepare_new_entry()
-            self.status_label.config(text="✅ Güncelleme başarılı", fg=Theme.SUCCESS_COLOR)
+            self.flash_status("✅ Güncelleme başarılı", Theme.SUCCESS_COLOR)
         else:
             messagebox.showerror("Hata", "Dosya güncellenemedi.", parent=self.root)
 
@@ -538,18 +1007,17 @@ class JournalApp:
         if self.current_entry_index is None: return
 
         entry = self.entries[self.current_entry_index]
-        confirm = messagebox.askyesno("Kayıt Sil", f"{entry['date']} tarihli kaydı silmek istediğinize emin misiniz?", parent=self.root)
+        confirm = messagebox.askyesno("Kayıt Sil", f"{entry.date} tarihli kaydı silmek istediğinize emin misiniz?", parent=self.root)
         
         if confirm:
-            # Remove from list
-            del self.entries[self.current_entry_index]
-            
-            # Rewrite file
-            if EntryParser.save_all_entries(self.entries):
-                messagebox.showinfo("Başarılı", "Kayıt silindi.", parent=self.root)
-                self.refresh_history()
+            # Delete only this entry's file, then drop it from memory
+            if EntryParser.remove_entry(entry):
+                del self.entries[self.current_entry_index]
+                self._date_index.pop(entry.date, None)
+                self.index_entries(self.current_entry_index) # Shift the following positions down
+                self.populate_history()
                 self.prepare_new_entry()
-                self.status_label.config(text="🗑️ Kayıt silindi", fg=Theme.ERROR_COLOR)
+                self.flash_status("🗑️ Kayıt silindi", Theme.ERROR_COLOR)
             else:
                 messagebox.showerror("Hata", "Dosya güncellenemedi (Silme başarısız).", parent=self.root)
 
@@ -590,10 +1058,12 @@ class JournalApp:
                 return
                 
             try:
-                with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                    json.dump({"password_hash": hash_password(p1)}, f)
-                messagebox.showinfo("Başarılı", "Şifre güncellendi.", parent=dialog)
+                # Keep the security question; only the password fields change
+                data = dict(self._config or {})
+                data.update(make_password_fields(p1))
+                self.store_config(data)
                 dialog.destroy()
+                self.flash_status("✅ Şifre güncellendi", Theme.SUCCESS_COLOR)
             except Exception as e:
                 messagebox.showerror("Hata", f"Kaydedilemedi: {e}", parent=dialog)
         
@@ -615,8 +1085,8 @@ class JournalApp:
             # Copy to images dir
             shutil.copy2(file_path, target_path)
             
-            # Insert tag with default width 400
-            tag = f"\n<<IMG:{new_filename}|400>>\n"
+            # Insert tag with the default width
+            tag = f"\n<<IMG:{new_filename}|{DEFAULT_IMG_WIDTH}>>\n"
             self.journal_text.insert(tk.INSERT, tag)
             
             # Render newly added content without clearing existing images
@@ -634,86 +1104,236 @@ class JournalApp:
         original_state = self.journal_text.cget("state")
         self.journal_text.config(state="normal")
 
-        start_pos = "1.0"
-        while True:
-            # Search for start of tag
-            pos = self.journal_text.search(r"<<IMG:", start_pos, stopindex=tk.END)
-            if not pos: break
-            
+        # One search call returns every visible marker and its length. Elided
+        # (already rendered) markers are skipped by Tk itself
+        text = self.journal_text
+        count_var = tk.Variable(text)
+        hits = text.tk.splitlist(text.tk.call(text._w, "search", "-all", "-regexp", "-count", str(count_var),
+                                              _IMG_SEARCH_PATTERN, "1.0", tk.END))
+        lengths = text.tk.splitlist(count_var.get()) if hits else ()
+
+        # Walk backwards so inserting an image never shifts a pending index
+        for pos, length in reversed(list(zip(hits, lengths))):
+            pos = str(pos)
             # Check if processed (if tag has our processing mark)
-            tags = self.journal_text.tag_names(pos)
-            if any(t.startswith("img_processed_") for t in tags):
-                start_pos = f"{pos}+1c"
+            if any(t.startswith("img_processed_") for t in text.tag_names(pos)):
                 continue
+            tag_end = f"{pos}+{int(length)}c"
+            match = _IMG_RE.fullmatch(text.get(pos, tag_end))
+            if not match:
+                continue
+
+            filename, width = match.group(1), int(match.group(2) or DEFAULT_IMG_WIDTH)
+            img_path = os.path.join(IMAGES_DIR, filename)
+            try:
+                mtime_ns = os.stat(img_path).st_mtime_ns
+            except OSError:
+                mtime_ns = None # Missing picture: leave the marker visible
             
-            # Get content to find end of tag
-            chunk = self.journal_text.get(pos, f"{pos} lineend + 100c")
-            match = re.match(r"(<<IMG:(.*?)>>)", chunk)
-            
-            if match:
-                full_tag = match.group(1)
-                inner = match.group(2)
+            if mtime_ns is not None:
+                # Unique ID for this image instance
+                self._img_counter += 1
+                group_tag = f"img_processed_{self._img_counter}"
                 
-                width = 400
-                filename = inner
-                if "|" in inner:
-                    try:
-                        parts = inner.split("|")
-                        filename = parts[0] 
-                        width = int(parts[1])
-                    except: pass
-                
-                img_path = os.path.join(IMAGES_DIR, filename)
-                tag_end = f"{pos}+{len(full_tag)}c"
+                # 1. Hide the code text using 'elide' (tag configured in _build_content)
+                text.tk.call(text._w, "tag", "add", group_tag, pos, tag_end)
+                text.tk.call(text._w, "tag", "add", "hidden_code", pos, tag_end)
                 
-                if os.path.exists(img_path):
-                    # Unique ID for this image instance
-                    uid = uuid.uuid4().hex[:8]
-                    group_tag = f"img_processed_{uid}"
-                    
-                    # 1. Hide the code text using 'elide'
-                    self.journal_text.tag_add(group_tag, pos, tag_end)
-                    self.journal_text.tag_add("hidden_code", pos, tag_end)
-                    self.journal_text.tag_config("hidden_code", elide=True)
-                    
-                    # 2. Insert image at the end of the hidden tag
-                    self.insert_image_to_text(img_path, width, tag_end, group_tag)
-                    
-                    start_pos = tag_end
+                # 2. Insert image at the end of the hidden tag; decode off-thread on a cache miss
+                key = (img_path, mtime_ns, width)
+                tk_img = self._img_cache.pop(key, None)
+                if tk_img is not None:
+                    self._img_cache[key] = tk_img # Re-insert as most recently used
+                    self.insert_image_to_text(tk_img, tag_end, group_tag)
                 else:
-                    # File not found
-                    start_pos = tag_end
-            else:
-                start_pos = f"{pos}+1c"
+                    self.request_decode(key, group_tag)
         
         # Restore state
         self.journal_text.config(state=original_state)
 
-    def insert_image_to_text(self, img_path, width, index, group_tag):
+    def request_decode(self, key, group_tag=None):
+        """Queues key for decoding; group_tag (if any) gets the image once it is ready."""
+        waiting = self._decode_waiting.get(key)
+        if waiting is None:
+            waiting = self._decode_waiting[key] = []
+            if group_tag is None:
+                self._prefetch_futures[key] = self._prefetch_pool.submit(self._decode_job, key)
+            else:
+                self._decode_pool.submit(self._decode_job, key)
+            self._start_polling()
+        elif group_tag is not None:
+            # Needed on screen now: move a prefetch that hasn't started to the main pool
+            future = self._prefetch_futures.pop(key, None)
+            if future is not None and future.cancel():
+                self._decode_pool.submit(self._decode_job, key)
+        # Same picture at the same width already on its way: just wait for it
+        if group_tag is not None:
+            waiting.append(group_tag)
+
+    def cancel_prefetches(self):
+        """Drops prefetch decodes that haven't started; they were for the previous selection."""
+        for key, future in list(self._prefetch_futures.items()):
+            if future.cancel():
+                del self._prefetch_futures[key]
+                del self._decode_waiting[key] # Nobody waits on a prefetch-only key
+
+    def prefetch_neighbours(self, index):
+        """Warms the image cache for the entries next to index, the likely next picks."""
+        self.cancel_prefetches()
+        self._prefetch_generation += 1
+        # Reading and scanning the files happens on the pool; the entries stay unloaded
+        paths = [self.entries[i].path for i in (index + 1, index - 1) if 0 <= i < len(self.entries)]
+        if paths:
+            self._prefetch_pool.submit(self._prefetch_scan_job, paths, self._prefetch_generation)
+            self._prefetch_scans += 1
+            self._start_polling()
+
+    def _prefetch_scan_job(self, paths, generation):
+        """Runs on a pool thread: lists the image keys used by the entry files in paths."""
+        keys = []
         try:
-            pil_img = Image.open(img_path)
-            
-            # Keep Aspect Ratio
-            w_percent = (width / float(pil_img.size[0]))
-            h_size = int((float(pil_img.size[1]) * float(w_percent)))
-            pil_img = pil_img.resize((width, h_size), Image.Resampling.LANCZOS)
-            
-            tk_img = ImageTk.PhotoImage(pil_img)
-            self.image_refs.append(tk_img)
-            
-            # Create image in text widget
-            self.journal_text.image_create(index, image=tk_img, padx=5, pady=5)
+            for path in paths:
+                try:
+                    with open(path, "rb") as f:
+                        content = EntryParser.decode(f.read())
+                except (OSError, ValueError):
+                    continue # Missing or unreadable: selecting it will report the error
+                for match in _IMG_RE.finditer(content):
+                    img_path = os.path.join(IMAGES_DIR, match.group(1))
+                    try:
+                        mtime_ns = os.stat(img_path).st_mtime_ns
+                    except OSError:
+                        continue
+                    keys.append((img_path, mtime_ns, int(match.group(2) or DEFAULT_IMG_WIDTH)))
+        finally:
+            # Always report back, or _poll_decoded would keep waiting for this scan
+            self._prefetched_q.put((generation, keys))
+
+    def _decode_job(self, key):
+        """Runs on a pool thread: opens and scales one image, never touches Tk."""
+        try:
+            result = load_scaled_image(*key)
+        except Exception as e:
+            result = e
+        self._decoded_q.put((key, result))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(DECODE_POLL_MS, self._poll_decoded)
+
+    def _poll_decoded(self):
+        try:
+            while True:
+                try:
+                    generation, keys = self._prefetched_q.get_nowait()
+                except queue.Empty:
+                    break
+                self._prefetch_scans -= 1
+                if generation != self._prefetch_generation:
+                    continue # The selection has moved on since this scan
+                for key in keys:
+                    if len(self._prefetch_futures) >= PREFETCH_IMAGES:
+                        break
+                    if key in self._img_cache or key in self._decode_waiting:
+                        continue
+                    self.request_decode(key)
+
+            ready = []
+            while True:
+                try:
+                    key, result = self._decoded_q.get_nowait()
+                except queue.Empty:
+                    break
+                group_tags = self._decode_waiting.pop(key)
+                self._prefetch_futures.pop(key, None)
+                if isinstance(result, Exception):
+                    print(f"Resim yükleme hatası: {result}")
+                    continue
+                ready.append((key, group_tags, result))
+            if ready:
+                self.apply_decoded_images(ready)
+        finally:
+            # Even after an error, keep polling: otherwise _polling stays set and
+            # no later decode would ever reach the editor
+            if self._decode_waiting or self._prefetch_scans:
+                self.root.after(DECODE_POLL_MS, self._poll_decoded)
+            else:
+                self._polling = False
+
+    def apply_decoded_images(self, ready):
+        """Inserts every image finished since the last poll under a single state toggle."""
+        photos = []
+        for key, group_tags, pil_img in ready:
+            try:
+                tk_img = ImageTk.PhotoImage(pil_img)
+            except Exception as e:
+                print(f"Resim yükleme hatası: {e}")
+                continue
+            finally:
+                pil_img.close() # Tk holds its own copy of the pixels now
+            if len(self._img_cache) >= IMG_CACHE_SIZE:
+                # Evicted images stay alive through image_refs while still on screen
+                del self._img_cache[next(iter(self._img_cache))]
+            self._img_cache[key] = tk_img
+            photos.append((tk_img, group_tags))
+
+        # The markers may be gone by now (entry switched, text deleted, screen closed)
+        text = self.journal_text
+        if not text.winfo_exists():
+            return
+        original_state = text.cget("state")
+        text.config(state="normal")
+        try:
+            for tk_img, group_tags in photos:
+                for group_tag in group_tags:
+                    try:
+                        self.place_image(tk_img, group_tag)
+                    except tk.TclError as e:
+                        print(f"Resim yükleme hatası: {e}")
+        finally:
+            text.config(state=original_state)
+
+    def place_image(self, tk_img, group_tag):
+        """Shows tk_img for the marker tagged group_tag; an existing picture is swapped in place."""
+        text = self.journal_text
+        ranges = text.tag_ranges(group_tag)
+        if not ranges:
+            return
+        last = f"{ranges[1]}-1c"
+        if text.dump(last, ranges[1], image=True):
+            text.image_configure(last, image=tk_img)
+            self.image_refs[group_tag] = tk_img # Drops the old size's reference
+        else:
+            self.insert_image_to_text(tk_img, ranges[1], group_tag)
+
+    def close(self):
+        """Drops queued image decodes so closing the window doesn't wait for them."""
+        self._decode_pool.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    def insert_image_to_text(self, tk_img, index, group_tag):
+        try:
+            self.image_refs[group_tag] = tk_img
             
-            # Apply group tag to the image too (it occupies 1 char)
-            self.journal_text.tag_add(group_tag, index, f"{index}+1c")
+            # Straight Tcl calls: image_create/tag_add would rebuild the option
+            # list through tkinter's wrappers for every image of a render
+            text = self.journal_text
+            text.tk.call(text._w, "image", "create", index, "-image", tk_img, "-padx", 5, "-pady", 5)
             
-            # Right-click binding for context menu
-            self.journal_text.tag_bind(group_tag, "<Button-3>", 
-                                     lambda e, t=group_tag: self.show_image_menu(e, t))
+            # Apply group tag to the image too (it occupies 1 char); the
+            # right-click menu finds the image through this tag
+            text.tk.call(text._w, "tag", "add", group_tag, index, f"{index}+1c")
             
         except Exception as e:
             print(f"Resim yükleme hatası: {e}")
 
+    def on_text_right_click(self, event):
+        for tag in self.journal_text.tag_names(f"@{event.x},{event.y}"):
+            if tag.startswith("img_processed_"):
+                self.show_image_menu(event, tag)
+                return
+
     def show_image_menu(self, event, group_tag):
         menu = tk.Menu(self.root, tearoff=0)
         menu.add_command(label="📏 Boyutu Değiştir", command=lambda: self.resize_image_action(group_tag))
@@ -730,32 +1350,42 @@ class JournalApp:
         text_content = self.journal_text.get(start, f"{end}-1c")
         
         # Parse current filename/width
-        match = re.search(r"<<IMG:(.*?)>>", text_content)
-        current_width = 400
-        filename = ""
-        if match:
-            inner = match.group(1)
-            filename = inner.split("|")[0]
-            if "|" in inner:
-                try: current_width = int(inner.split("|")[1])
-                except: pass
+        match = _IMG_RE.search(text_content)
+        if not match: return
+        filename, current_width = match.group(1), int(match.group(2) or DEFAULT_IMG_WIDTH)
         
         # Ask for new width
         new_width = simpledialog.askinteger("Resim Boyutu", "Yeni genişlik (px):", 
                                           initialvalue=current_width, minvalue=50, maxvalue=1000, parent=self.root)
-        if not new_width: return
+        if not new_width or new_width == current_width: return
+
+        # Images decoded while the dialog was open may have shifted the group
+        ranges = self.journal_text.tag_ranges(group_tag)
+        if not ranges: return
+        start, end = ranges[0], ranges[1]
         
         # Determine edit state to unlock widget
         was_disabled = self.journal_text.cget("state") == "disabled"
         self.journal_text.config(state="normal")
         
-        # Replace the entire group (text + image) with new tag
-        self.journal_text.delete(start, end)
+        # Rewrite only the hidden marker; the picture itself stays where it is
+        self.journal_text.delete(start, f"{end}-1c")
         new_tag = f"<<IMG:{filename}|{new_width}>>"
-        self.journal_text.insert(start, new_tag)
+        self.journal_text.insert(start, new_tag, (group_tag, "hidden_code"))
         
-        # Re-render immediately
-        self.render_images(clear_refs=False)
+        # Swap in the new size: straight from the cache, or once the pool has decoded it
+        img_path = os.path.join(IMAGES_DIR, filename)
+        remove_thumbnails(img_path, width=current_width) # The old size is rebuilt if still used elsewhere
+        try:
+            key = (img_path, os.stat(img_path).st_mtime_ns, new_width)
+        except OSError:
+            key = None
+        if key is not None:
+            tk_img = self._img_cache.get(key)
+            if tk_img is not None:
+                self.place_image(tk_img, group_tag)
+            else:
+                self.request_decode(key, group_tag)
         
         if was_disabled:
             self.journal_text.config(state="disabled")
@@ -763,6 +1393,10 @@ class JournalApp:
     def delete_image_action(self, group_tag):
         ranges = self.journal_text.tag_ranges(group_tag)
         if ranges:
+            match = _IMG_RE.search(self.journal_text.get(ranges[0], ranges[1]))
+            if match:
+                remove_thumbnails(os.path.join(IMAGES_DIR, match.group(1)))
+            self.image_refs.pop(group_tag, None)
             was_disabled = self.journal_text.cget("state") == "disabled"
             self.journal_text.config(state="normal")
             self.journal_text.delete(ranges[0], ranges[1])
@@ -774,6 +1408,7 @@ def main():
         root = tk.Tk()
         app = JournalApp(root)
         root.mainloop()
+        app.close()
     except Exception as e:
         print(f"Başlatma hatası: {e}")
 